@@ -10,12 +10,26 @@ another already-connected instance to send the QR code to someone.
 import requests
 import json
 import time
+from typing import Optional, Any
+
+from uazapi_timeouts import AdaptiveTimeouts
 
 
 class UazapiSender:
-    def __init__(self, base_url: str, admin_token: str):
+    """
+    Client for sending WhatsApp messages through a connected instance
+
+    Requests run under AdaptiveTimeouts and raise requests.exceptions.Timeout
+    when the server does not answer in time. After a ReadTimeout the message
+    may still have been sent, so do not blindly retry.
+    """
+
+    def __init__(self, base_url: str, admin_token: str, session: Any = None,
+                 timeouts: Optional[AdaptiveTimeouts] = None):
         self.base_url = base_url.rstrip('/')
         self.admin_token = admin_token
+        self.http = session or requests
+        self.timeouts = timeouts or AdaptiveTimeouts()
 
     def send_text(self, instance_token: str, phone_number: str, message: str):
         """
@@ -42,7 +56,7 @@ class UazapiSender:
             'message': message
         }
 
-        response = requests.post(url, headers=headers, json=payload)
+        response = self.timeouts.request(self.http, 'POST', url, headers=headers, json=payload)
         return response.json()
 
     def send_media(self, instance_token: str, phone_number: str, media_base64: str, caption: str = ""):
@@ -72,7 +86,7 @@ class UazapiSender:
             'caption': caption
         }
 
-        response = requests.post(url, headers=headers, json=payload)
+        response = self.timeouts.request(self.http, 'POST', url, headers=headers, json=payload)
         return response.json()
 
 
@@ -7,20 +7,34 @@ Helps interact with UAZAPI for instance management and QR code retrieval
 import requests
 import json
 import time
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator, List, Tuple
+
+from uazapi_timeouts import AdaptiveTimeouts
 
 
 class UazapiClient:
-    def __init__(self, base_url: str, admin_token: str):
+    # Candidate endpoints for listing instances, tried in order
+    LIST_ENDPOINTS = [
+        '/instance/list',
+        '/instances',
+        '/api/instances',
+        '/v1/instances',
+        '/v2/instances',
+        '/instance/fetchInstances'
+    ]
+
+    def __init__(self, base_url: str, admin_token: str, timeouts: Optional[AdaptiveTimeouts] = None):
         """
         Initialize UAZAPI client
 
         Args:
             base_url: Base URL of the API (e.g., https://chatsheros.uazapi.com)
             admin_token: Admin token for authentication
+            timeouts: Per-endpoint adaptive timeouts (defaults to 30s until latency is observed)
         """
         self.base_url = base_url.rstrip('/')
         self.admin_token = admin_token
+        self.timeouts = timeouts or AdaptiveTimeouts()
         self.headers = {
             'Content-Type': 'application/json',
         }
@@ -33,8 +47,14 @@ class UazapiClient:
             {'api-key': admin_token},
             {'x-api-key': admin_token}
         ]
-
-    def _make_request(self, method: str, endpoint: str, data: Optional[Dict] = None, auth_header: Optional[Dict] = None) -> Dict[Any, Any]:
+        # Working list endpoint, discovered on first paginated listing
+        self._list_endpoint: Optional[str] = None
+        # Instances seen by the last complete incremental listing, keyed by instance key
+        self.instance_snapshot: Dict[str, Dict] = {}
+        self._listing_complete = False
+
+    def _make_request(self, method: str, endpoint: str, data: Optional[Dict] = None, auth_header: Optional[Dict] = None,
+                      params: Optional[Dict] = None, verbose: bool = True) -> Dict[Any, Any]:
         """
         Make HTTP request to API
 
@@ -43,6 +63,8 @@ class UazapiClient:
             endpoint: API endpoint
             data: Request payload (for POST requests)
             auth_header: Specific auth header to use
+            params: Query string parameters
+            verbose: Print the request line, status code, payload and response (disable for large listings)
 
         Returns:
             Response JSON
@@ -57,29 +79,30 @@ class UazapiClient:
             headers.update(self.auth_headers[0])  # Default to first auth pattern
 
         try:
-            print(f"\n🔹 {method} {url}")
-
-            if method.upper() == 'GET':
-                response = requests.get(url, headers=headers, timeout=30)
-            elif method.upper() == 'POST':
-                print(f"📤 Payload: {json.dumps(data, indent=2)}")
-                response = requests.post(url, headers=headers, json=data, timeout=30)
-            elif method.upper() == 'PUT':
-                response = requests.put(url, headers=headers, json=data, timeout=30)
-            elif method.upper() == 'DELETE':
-                response = requests.delete(url, headers=headers, timeout=30)
+            if verbose:
+                print(f"\n🔹 {method} {url}")
+
+            if method.upper() in ('GET', 'DELETE'):
+                response = self.timeouts.request(requests, method, url, headers=headers, params=params)
+            elif method.upper() in ('POST', 'PUT'):
+                if verbose and method.upper() == 'POST':
+                    print(f"📤 Payload: {json.dumps(data, indent=2)}")
+                response = self.timeouts.request(requests, method, url, headers=headers, json=data, params=params)
             else:
                 raise ValueError(f"Unsupported HTTP method: {method}")
 
-            print(f"📥 Status Code: {response.status_code}")
+            if verbose:
+                print(f"📥 Status Code: {response.status_code}")
 
             # Try to parse JSON response
             try:
                 result = response.json()
-                print(f"📦 Response: {json.dumps(result, indent=2)}")
+                if verbose:
+                    print(f"📦 Response: {json.dumps(result, indent=2)}")
                 return result
             except json.JSONDecodeError:
-                print(f"📦 Response (text): {response.text}")
+                if verbose:
+                    print(f"📦 Response (text): {response.text}")
                 return {"status_code": response.status_code, "text": response.text}
 
         except requests.exceptions.RequestException as e:
@@ -210,22 +233,191 @@ class UazapiClient:
         print("Listing Instances...")
         print("="*50)
 
-        endpoints = [
-            '/instance/list',
-            '/instances',
-            '/api/instances',
-            '/v1/instances',
-            '/v2/instances',
-            '/instance/fetchInstances'
-        ]
-
-        for endpoint in endpoints:
+        for endpoint in self.LIST_ENDPOINTS:
             result = self._make_request('GET', endpoint)
-            if result.get('status_code') != 404 and 'error' not in result:
+            if isinstance(result, list) or (result.get('status_code') != 404 and 'error' not in result):
                 return result
 
         return {"error": "Could not find working list instances endpoint"}
 
+    @staticmethod
+    def _instance_key(instance: Dict) -> str:
+        """
+        Build a stable key identifying an instance across listings
+
+        Args:
+            instance: Instance entry from a list response
+
+        Returns:
+            Instance ID, name or token; the canonical JSON of the entry as a last resort
+        """
+        if isinstance(instance, dict):
+            nested = instance.get('instance') if isinstance(instance.get('instance'), dict) else {}
+            for field in ('id', 'instanceId', 'name', 'instanceName', 'token'):
+                value = instance.get(field) or nested.get(field)
+                if value:
+                    return str(value)
+        return json.dumps(instance, sort_keys=True)
+
+    @staticmethod
+    def _extract_page(result: Any) -> Optional[Tuple[List[Dict], Optional[bool]]]:
+        """
+        Split a list response into its instances and a "more pages" hint
+
+        Args:
+            result: Parsed list response (bare list or wrapper object)
+
+        Returns:
+            (instances, has_more) - has_more is None when the response carries no pagination metadata.
+            None when the response is not a recognisable instance list (e.g. an error body).
+        """
+        if isinstance(result, list):
+            return result, None
+        if not isinstance(result, dict):
+            return None
+
+        for field in ('instances', 'data', 'results', 'items'):
+            if isinstance(result.get(field), list):
+                instances = result[field]
+                break
+        else:
+            return None
+
+        meta = result.get('pagination') or result.get('meta')
+        if not isinstance(meta, dict):
+            meta = result
+
+        for field in ('hasMore', 'has_more', 'hasNextPage', 'nextPage', 'next_page', 'next'):
+            if field in meta:
+                return instances, bool(meta[field])
+
+        page = meta.get('page') or meta.get('currentPage')
+        total_pages = meta.get('totalPages') or meta.get('total_pages')
+        if page is not None and total_pages is not None:
+            return instances, int(page) < int(total_pages)
+
+        return instances, None
+
+    def _fetch_instance_page(self, page: int, page_size: int,
+                             verbose: bool) -> Optional[Tuple[List[Dict], Optional[bool]]]:
+        """
+        Fetch one page of instances, discovering the list endpoint on first use
+
+        Error responses (request failures, HTTP 4xx/5xx bodies, or anything
+        that is not an instance list) count as failures, never as empty pages.
+
+        Args:
+            page: 1-based page number
+            page_size: Instances requested per page
+            verbose: Print the raw response
+
+        Returns:
+            (instances, has_more) as returned by _extract_page, or None if the page could not be fetched
+        """
+        endpoints = [self._list_endpoint] if self._list_endpoint else self.LIST_ENDPOINTS
+        params = {'page': page, 'limit': page_size}
+
+        for endpoint in endpoints:
+            result = self._make_request('GET', endpoint, params=params, verbose=verbose)
+            if isinstance(result, dict) and ('error' in result or result.get('status_code', 0) >= 400):
+                continue
+            parsed = self._extract_page(result)
+            if parsed is not None:
+                self._list_endpoint = endpoint
+                return parsed
+
+        print(f"❌ Could not fetch page {page} of the instance list")
+        return None
+
+    def iter_instances(self, page_size: int = 100, verbose: bool = False) -> Iterator[Dict]:
+        """
+        Stream instances page by page instead of fetching the whole list at once
+
+        Sends page/limit query parameters and follows the server's pagination
+        metadata when present. A first page without metadata and with more
+        than page_size entries means the server ignores pagination, so that
+        single response is the whole list and no further page is fetched.
+
+        The listing is marked incomplete, and iteration stops, when a page
+        fails or when a page that should be new repeats only entries already
+        seen (e.g. a server that honours limit but ignores page), since the
+        rest of the list cannot be reached.
+
+        Args:
+            page_size: Instances requested per page
+            verbose: Pretty-print each page's raw response
+
+        Yields:
+            Instance entries, each at most once
+        """
+        self._listing_complete = False
+        seen = set()
+        page = 1
+
+        while True:
+            parsed = self._fetch_instance_page(page, page_size, verbose)
+            if parsed is None:
+                return
+
+            instances, has_more = parsed
+            unpaginated = page == 1 and has_more is None and len(instances) > page_size
+            new_count = 0
+            for instance in instances:
+                key = self._instance_key(instance)
+                if key in seen:
+                    continue
+                seen.add(key)
+                new_count += 1
+                yield instance
+
+            if unpaginated or has_more is False or not instances:
+                break
+            if has_more is None and len(instances) < page_size:
+                break
+            if new_count == 0:
+                print(f"❌ Page {page} repeated earlier instances; the server ignores the page parameter")
+                return
+            page += 1
+
+        self._listing_complete = True
+
+    def iter_instance_changes(self, snapshot: Optional[Dict[str, Dict]] = None,
+                              page_size: int = 100) -> Iterator[Tuple[str, Dict]]:
+        """
+        Stream only the instances added, changed or removed since the last snapshot
+
+        Added and changed instances are yielded as their page arrives, removed
+        ones after the listing completes. The snapshot is replaced only after a
+        complete listing, so a failed or abandoned run never reports phantom
+        removals.
+
+        Args:
+            snapshot: Snapshot to diff against (defaults to self.instance_snapshot)
+            page_size: Instances requested per page
+
+        Yields:
+            (change, instance) tuples where change is 'added', 'changed' or 'removed'
+        """
+        previous = self.instance_snapshot if snapshot is None else snapshot
+        current: Dict[str, Dict] = {}
+
+        for instance in self.iter_instances(page_size=page_size):
+            key = self._instance_key(instance)
+            current[key] = instance
+            if key not in previous:
+                yield 'added', instance
+            elif previous[key] != instance:
+                yield 'changed', instance
+
+        if not self._listing_complete:
+            return
+
+        for key, instance in previous.items():
+            if key not in current:
+                yield 'removed', instance
+
+        self.instance_snapshot = current
+
     def start_instance(self, instance_id: str) -> Dict:
         """
         Start/connect an instance
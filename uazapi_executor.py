@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+UAZAPI Thread-Pool Executor
+Runs UazapiWhatsApp and UazapiSender calls in parallel for callers that
+cannot use asyncio, without overwhelming a single UAZAPI host
+"""
+
+import threading
+import time
+from http.cookiejar import DefaultCookiePolicy
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from typing import Optional, Dict, Iterable, Iterator, List, Callable, Any
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from uazapi_whatsapp import UazapiWhatsApp
+from send_qr_via_whatsapp import UazapiSender
+from uazapi_timeouts import AdaptiveTimeouts
+
+
+class HostLimiter:
+    """
+    Per-host concurrency limit shared by any number of executors
+
+    Each host gets its own semaphore, so calls to one UAZAPI host never
+    exceed the limit no matter how many worker threads are waiting.
+    """
+
+    def __init__(self, per_host_limit: int = 8):
+        """
+        Initialize the limiter
+
+        Args:
+            per_host_limit: Maximum in-flight calls per host
+        """
+        if per_host_limit < 1:
+            raise ValueError("per_host_limit must be at least 1")
+        self.per_host_limit = per_host_limit
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def _semaphore(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self.per_host_limit)
+            return self._semaphores[host]
+
+    @contextmanager
+    def limit(self, url: str) -> Iterator[None]:
+        """Hold one of the host's slots for the duration of the block"""
+        semaphore = self._semaphore(urlparse(url).netloc)
+        with semaphore:
+            yield
+
+
+class ThreadLocalSession:
+    """
+    One requests.Session per thread, all sharing a single connection pool
+
+    The HTTPAdapter (urllib3 pool) is thread-safe and shared, so connections
+    are reused across threads; the Session objects are not shared. Cookies
+    are disabled, so a Set-Cookie from one instance's response is never
+    replayed on calls made with another instance's token.
+    """
+
+    def __init__(self, adapter: HTTPAdapter):
+        """
+        Initialize the session factory
+
+        Args:
+            adapter: Connection pool shared by every thread's session
+        """
+        self.adapter = adapter
+        self._local = threading.local()
+        self._sessions: List[requests.Session] = []
+        self._lock = threading.Lock()
+
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+            session.mount('http://', self.adapter)
+            session.mount('https://', self.adapter)
+            self._local.session = session
+            with self._lock:
+                self._sessions.append(session)
+        return session
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request on the calling thread's session"""
+        return self._session().request(method, url, **kwargs)
+
+    def close(self, close_adapter: bool = True):
+        """
+        Drop every thread's session
+
+        Args:
+            close_adapter: Also close the shared pool (False if it is owned elsewhere)
+        """
+        # Session.close() would only close the mounted adapters, which are all the shared one
+        with self._lock:
+            self._sessions = []
+        if close_adapter:
+            self.adapter.close()
+
+
+class UazapiExecutor:
+    """
+    Executor-backed facade over UazapiWhatsApp and UazapiSender
+
+    Every method returns a Future. Each worker thread has its own
+    cookie-free requests.Session, and all of them share one HTTPAdapter
+    whose connection pool is sized to the per-host limit (see
+    ThreadLocalSession).
+
+    Example:
+        with UazapiExecutor(BASE_URL, ADMIN_TOKEN, max_workers=64) as pool:
+            created = [f.result() for f in pool.map_create_instance(names)]
+            statuses = pool.map_get_instance_status([c['token'] for c in created])
+    """
+
+    def __init__(self, base_url: str, admin_token: str, max_workers: int = 16, per_host_limit: int = 8,
+                 host_limiter: Optional[HostLimiter] = None, adapter: Optional[HTTPAdapter] = None,
+                 timeouts: Optional[AdaptiveTimeouts] = None):
+        """
+        Initialize the executor
+
+        Args:
+            base_url: Base URL of the API (e.g., https://chatsheros.uazapi.com)
+            admin_token: Admin token for authentication
+            max_workers: Size of the thread pool
+            per_host_limit: Maximum in-flight calls to the host (ignored if host_limiter is given)
+            host_limiter: Limiter to share with other executors talking to the same hosts
+            adapter: Connection pool to share; by default one of per_host_limit connections per host
+            timeouts: Adaptive timeouts shared by both clients (hedging must be off)
+        """
+        self.base_url = base_url.rstrip('/')
+        self.host_limiter = host_limiter or HostLimiter(per_host_limit)
+
+        self._owns_adapter = adapter is None
+        if adapter is None:
+            pool_size = self.host_limiter.per_host_limit
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, pool_block=True)
+        self.http = ThreadLocalSession(adapter)
+
+        self.timeouts = timeouts or AdaptiveTimeouts()
+        if self.timeouts.hedge:
+            # A duplicate would wait for the host limit and the blocking pool, so it cannot cut the tail
+            raise ValueError("Hedged requests are not supported with UazapiExecutor's per-host limit")
+        self.whatsapp = UazapiWhatsApp(base_url, admin_token, session=self.http, timeouts=self.timeouts)
+        self.sender = UazapiSender(base_url, admin_token, session=self.http, timeouts=self.timeouts)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='uazapi')
+
+    def submit(self, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        """
+        Run fn(*args, **kwargs) on the pool under the host's concurrency limit
+
+        Returns:
+            Future resolving to fn's return value
+        """
+        def limited():
+            with self.host_limiter.limit(self.base_url):
+                return fn(*args, **kwargs)
+
+        return self.executor.submit(limited)
+
+    # Single calls
+
+    def create_instance(self, name: Optional[str] = None) -> Future:
+        """Create an instance (see UazapiWhatsApp.create_instance)"""
+        return self.submit(self.whatsapp.create_instance, name or f"whatsapp_{time.time_ns()}")
+
+    def connect_instance(self, instance_token: str) -> Future:
+        """Connect an instance and get its QR code (see UazapiWhatsApp.connect_instance)"""
+        return self.submit(self.whatsapp.connect_instance, instance_token)
+
+    def get_instance_status(self, instance_token: str) -> Future:
+        """Get an instance's status (see UazapiWhatsApp.get_instance_status)"""
+        return self.submit(self.whatsapp.get_instance_status, instance_token)
+
+    def send_text(self, instance_token: str, phone_number: str, message: str) -> Future:
+        """Send a text message (see UazapiSender.send_text)"""
+        return self.submit(self.sender.send_text, instance_token, phone_number, message)
+
+    def send_media(self, instance_token: str, phone_number: str, media_base64: str, caption: str = "") -> Future:
+        """Send an image/media message (see UazapiSender.send_media)"""
+        return self.submit(self.sender.send_media, instance_token, phone_number, media_base64, caption)
+
+    # Batch calls - one future per item, in input order
+
+    def map_create_instance(self, names: Iterable[str]) -> List[Future]:
+        """Create one instance per name"""
+        return [self.create_instance(name) for name in names]
+
+    def map_connect_instance(self, instance_tokens: Iterable[str]) -> List[Future]:
+        """Connect each instance"""
+        return [self.connect_instance(token) for token in instance_tokens]
+
+    def map_get_instance_status(self, instance_tokens: Iterable[str]) -> List[Future]:
+        """Get the status of each instance"""
+        return [self.get_instance_status(token) for token in instance_tokens]
+
+    def map_send_text(self, instance_token: str, phone_numbers: Iterable[str], message: str) -> List[Future]:
+        """Send the same text from one connected instance to each phone number"""
+        return [self.send_text(instance_token, phone, message) for phone in phone_numbers]
+
+    def map_send_media(self, instance_token: str, phone_numbers: Iterable[str], media_base64: str,
+                       caption: str = "") -> List[Future]:
+        """Send the same media from one connected instance to each phone number"""
+        return [self.send_media(instance_token, phone, media_base64, caption) for phone in phone_numbers]
+
+    @staticmethod
+    def as_completed(futures: Iterable[Future], timeout: Optional[float] = None) -> Iterator[Future]:
+        """Yield futures as they finish (concurrent.futures.as_completed)"""
+        return as_completed(futures, timeout=timeout)
+
+    def shutdown(self, wait: bool = True):
+        """Stop the thread pool and close the connection pool if this executor created it"""
+        self.executor.shutdown(wait=wait)
+        self.http.close(close_adapter=self._owns_adapter)
+
+    def __enter__(self) -> 'UazapiExecutor':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown()
+
+
+def main():
+    """
+    Example usage: create, connect and check several instances in parallel
+    """
+
+    # Configuration
+    BASE_URL = "https://chatsheros.uazapi.com"
+    ADMIN_TOKEN = "TPWVDMxqpcsBpKahh0B3ec1f4V8OVy1GvRCDunxHzilvmZxAv8"
+
+    with UazapiExecutor(BASE_URL, ADMIN_TOKEN, max_workers=16, per_host_limit=4) as pool:
+        print("=" * 60)
+        print("Creating 3 WhatsApp instances in parallel...")
+        print("=" * 60)
+
+        names = [f"whatsapp_{int(time.time())}_{i}" for i in range(3)]
+        created = [future.result() for future in pool.map_create_instance(names)]
+        tokens = [response['token'] for response in created]
+
+        for future in pool.as_completed(pool.map_connect_instance(tokens)):
+            response = future.result()
+            print(f"✓ {response['instance']['id']}: {response['instance']['status']}")
+
+        for token, future in zip(tokens, pool.map_get_instance_status(tokens)):
+            print(f"  - {token}: {future.result()['instance']['status']}")
+
+
+if __name__ == "__main__":
+    main()
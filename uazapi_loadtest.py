@@ -0,0 +1,924 @@
+#!/usr/bin/env python3
+"""
+UAZAPI Load Generator
+Replays the n8n workflow call sequence with N virtual users against a
+local stand-in server and reports throughput, latency and resource growth
+"""
+
+import argparse
+import base64
+import json
+import multiprocessing
+import os
+import random
+import re
+import threading
+import time
+import uuid
+from array import array
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Dict, Any, List, Tuple
+from urllib.parse import urlparse
+
+import requests
+
+
+# 1x1 transparent PNG served as the stand-in QR code
+PLACEHOLDER_QR = "data:image/png;base64," + base64.b64encode(bytes.fromhex(
+    '89504e470d0a1a0a0000000d4948445200000001000000010806000000'
+    '1f15c4890000000d49444154789c6360000002000154a24f5d0000000049454e44ae426082'
+)).decode()
+
+WAIT_UNITS = {'seconds': 1, 'minutes': 60, 'hours': 3600, 'days': 86400}
+
+# Shortest post-warm-up span, in seconds, over which an hourly growth rate is reported
+MIN_RATE_SPAN = 60
+
+
+# ---------------------------------------------------------------------------
+# n8n expressions
+# ---------------------------------------------------------------------------
+
+class _ExpressionParser:
+    """
+    Minimal evaluator for the n8n expressions used in our workflows
+
+    Supports string/number literals, object literals, '+' (sum or concat),
+    $json.path, $('Node').item.json.path and $now.toUnixInteger().
+    Anything else raises ValueError.
+    """
+
+    def __init__(self, text: str, current: Dict, outputs: Dict[str, Dict]):
+        self.text = text
+        self.pos = 0
+        self.current = current
+        self.outputs = outputs
+
+    def parse(self) -> Any:
+        value = self._expr()
+        self._skip()
+        if self.pos != len(self.text):
+            raise ValueError(f"Unsupported expression: {self.text!r}")
+        return value
+
+    def _skip(self):
+        while self.pos < len(self.text) and self.text[self.pos].isspace():
+            self.pos += 1
+
+    def _peek(self) -> str:
+        self._skip()
+        return self.text[self.pos] if self.pos < len(self.text) else ''
+
+    def _expect(self, literal: str):
+        self._skip()
+        if not self.text.startswith(literal, self.pos):
+            raise ValueError(f"Expected {literal!r} at {self.pos} in {self.text!r}")
+        self.pos += len(literal)
+
+    def _expr(self) -> Any:
+        value = self._term()
+        while self._peek() == '+':
+            self.pos += 1
+            other = self._term()
+            if _is_number(value) and _is_number(other):
+                value = value + other
+            else:
+                value = _to_text(value) + _to_text(other)
+        return value
+
+    def _term(self) -> Any:
+        char = self._peek()
+        if char in ('"', "'"):
+            return self._string()
+        if char == '{':
+            return self._object()
+        if char == '$':
+            return self._reference()
+        match = re.compile(r'-?\d+(\.\d+)?').match(self.text, self.pos)
+        if match:
+            self.pos = match.end()
+            return float(match.group()) if match.group(1) else int(match.group())
+        raise ValueError(f"Unsupported expression: {self.text!r}")
+
+    def _string(self) -> str:
+        quote = self.text[self.pos]
+        self.pos += 1
+        escapes = {'n': '\n', 't': '\t', 'r': '\r'}
+        chars = []
+        while self.pos < len(self.text) and self.text[self.pos] != quote:
+            char = self.text[self.pos]
+            if char == '\\':
+                self.pos += 1
+                char = escapes.get(self.text[self.pos], self.text[self.pos])
+            chars.append(char)
+            self.pos += 1
+        self._expect(quote)
+        return ''.join(chars)
+
+    def _object(self) -> Dict:
+        self._expect('{')
+        result = {}
+        while self._peek() != '}':
+            key = self._string() if self._peek() in ('"', "'") else self._identifier()
+            self._expect(':')
+            result[key] = self._expr()
+            if self._peek() == ',':
+                self.pos += 1
+        self._expect('}')
+        return result
+
+    def _identifier(self) -> str:
+        self._skip()
+        match = re.compile(r'[A-Za-z_$][\w$]*').match(self.text, self.pos)
+        if not match:
+            raise ValueError(f"Expected identifier at {self.pos} in {self.text!r}")
+        self.pos = match.end()
+        return match.group()
+
+    def _reference(self) -> Any:
+        if self.text.startswith('$now', self.pos):
+            self.pos += len('$now')
+            if self.text.startswith('.toUnixInteger()', self.pos):
+                self.pos += len('.toUnixInteger()')
+            return int(time.time())
+
+        if self.text.startswith('$json', self.pos):
+            self.pos += len('$json')
+            value = self.current
+        elif self.text.startswith('$(', self.pos):
+            self.pos += len('$(')
+            node = self._string()
+            self._expect(')')
+            self._expect('.item.json')
+            value = self.outputs.get(node)
+        else:
+            raise ValueError(f"Unsupported reference in {self.text!r}")
+
+        while self.pos < len(self.text) and self.text[self.pos] == '.':
+            self.pos += 1
+            key = self._identifier()
+            value = value.get(key) if isinstance(value, dict) else None
+        return value
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _to_text(value: Any) -> str:
+    return '' if value is None else str(value)
+
+
+def resolve_value(value: Any, current: Dict, outputs: Dict[str, Dict]) -> Any:
+    """
+    Resolve an n8n parameter value against the replay context
+
+    Args:
+        value: Raw parameter value ('=' prefix marks an expression)
+        current: Input item of the node being executed ($json)
+        outputs: Output item of every node executed so far ($('Node'))
+
+    Returns:
+        Resolved value (unsupported expressions are returned verbatim)
+    """
+    if not isinstance(value, str) or not value.startswith('='):
+        return value
+
+    text = value[1:]
+    try:
+        whole = re.fullmatch(r'\s*\{\{(.*)\}\}\s*', text, re.S)
+        if whole and '{{' not in whole.group(1):
+            return _ExpressionParser(whole.group(1), current, outputs).parse()
+        if '{{' in text:
+            return re.sub(
+                r'\{\{(.*?)\}\}',
+                lambda m: _to_text(_ExpressionParser(m.group(1), current, outputs).parse()),
+                text, flags=re.S
+            )
+        return _ExpressionParser(text, current, outputs).parse()
+    except (ValueError, IndexError):
+        return text
+
+
+# ---------------------------------------------------------------------------
+# Call graph
+# ---------------------------------------------------------------------------
+
+class CallGraph:
+    """
+    Call graph extracted from an n8n workflow definition
+
+    Attributes:
+        name: Workflow name
+        nodes: Node definitions keyed by node name
+        edges: For each node, a list of outputs, each a list of target node names
+        start: Name of the trigger (webhook) node
+    """
+
+    def __init__(self, workflow: Dict):
+        self.name = workflow.get('name', 'workflow')
+        self.nodes = {node['name']: node for node in workflow.get('nodes', [])}
+        self.edges: Dict[str, List[List[str]]] = {}
+
+        for source, connection in workflow.get('connections', {}).items():
+            self.edges[source] = [
+                [target['node'] for target in (output or [])]
+                for output in connection.get('main', [])
+            ]
+
+        triggers = [name for name, node in self.nodes.items() if node['type'].endswith('.webhook')]
+        if not triggers:
+            raise ValueError(f"Workflow '{self.name}' has no webhook trigger node")
+        self.start = triggers[0]
+
+    @classmethod
+    def from_file(cls, path: str) -> 'CallGraph':
+        """Load a call graph from an exported n8n workflow JSON file"""
+        with open(path) as f:
+            return cls(json.load(f))
+
+    def http_nodes(self) -> List[str]:
+        """Names of the HTTP request nodes reachable from the trigger, in traversal order"""
+        order, seen, stack = [], set(), [self.start]
+        while stack:
+            name = stack.pop(0)
+            if name in seen or name not in self.nodes:
+                continue
+            seen.add(name)
+            if self.nodes[name]['type'].endswith('.httpRequest'):
+                order.append(name)
+            for output in self.edges.get(name, []):
+                stack.extend(output)
+        return order
+
+    def describe(self) -> str:
+        """Human-readable summary of the HTTP calls in the workflow"""
+        lines = [f"📋 {self.name}"]
+        for name in self.http_nodes():
+            params = self.nodes[name]['parameters']
+            path = urlparse(params.get('url', '')).path
+            lines.append(f"  - {params.get('method', 'GET'):6} {path:20} ({name})")
+        return '\n'.join(lines)
+
+
+# ---------------------------------------------------------------------------
+# Metrics
+# ---------------------------------------------------------------------------
+
+class LatencyRecorder:
+    """
+    Thread-safe latency recorder with bounded memory
+
+    Keeps exact count, sum and max, plus a fixed-size reservoir sample for
+    percentiles. The reservoir is preallocated, so recording never grows
+    memory and does not show up as growth in soak runs.
+    """
+
+    def __init__(self, reservoir_size: int = 10000):
+        self.reservoir_size = reservoir_size
+        self.samples = array('d', [0.0]) * reservoir_size
+        self.filled = 0
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float, error: bool = False):
+        with self._lock:
+            self.count += 1
+            self.total += seconds
+            self.max = max(self.max, seconds)
+            if error:
+                self.errors += 1
+            if self.filled < self.reservoir_size:
+                self.samples[self.filled] = seconds
+                self.filled += 1
+            else:
+                index = random.randrange(self.count)
+                if index < self.reservoir_size:
+                    self.samples[index] = seconds
+
+    def percentile(self, pct: float) -> float:
+        with self._lock:
+            ordered = sorted(self.samples[:self.filled])
+        if not ordered:
+            return 0.0
+        index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'mean_ms': (self.total / self.count * 1000) if self.count else 0.0,
+            'p50_ms': self.percentile(50) * 1000,
+            'p90_ms': self.percentile(90) * 1000,
+            'p95_ms': self.percentile(95) * 1000,
+            'p99_ms': self.percentile(99) * 1000,
+            'max_ms': self.max * 1000,
+        }
+
+
+def _resource_snapshot() -> Dict[str, Optional[float]]:
+    """
+    Current process RSS, thread count and open file descriptors
+
+    RSS is None without /proc: getrusage only reports peak RSS, which cannot
+    show growth.
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            rss_mb = int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        rss_mb = None
+
+    try:
+        fds = len(os.listdir('/proc/self/fd'))
+    except OSError:
+        fds = -1
+
+    return {'rss_mb': rss_mb, 'threads': threading.active_count(), 'fds': fds}
+
+
+# ---------------------------------------------------------------------------
+# Replay
+# ---------------------------------------------------------------------------
+
+class LoadGenerator:
+    """
+    Replays a workflow's call graph with N virtual users
+
+    Each virtual user runs the workflow from its webhook trigger in a loop,
+    executing HTTP request, set, if, wait and merge nodes in order. HTTP
+    calls are redirected to base_url, keeping the workflow's path, method,
+    headers and body.
+    """
+
+    def __init__(self, graph: CallGraph, base_url: str, users: int = 10, duration: float = 60,
+                 ramp_up: float = 0, wait_scale: float = 0.0, max_steps: int = 200,
+                 sample_interval: float = 5, warmup: float = 10, timeout: float = 30):
+        """
+        Initialize the load generator
+
+        Args:
+            graph: Call graph to replay
+            base_url: Server to send the calls to (e.g., the local stand-in)
+            users: Number of concurrent virtual users
+            duration: Run length in seconds (use hours for soak runs)
+            ramp_up: Seconds over which virtual users are started
+            wait_scale: Multiplier for wait nodes (0 skips waits)
+            max_steps: Node executions per iteration before it is aborted
+            sample_interval: Seconds between throughput/resource samples
+            warmup: Seconds after start before the resource growth baseline is taken
+            timeout: Per-request timeout in seconds
+        """
+        self.graph = graph
+        self.base_url = base_url.rstrip('/')
+        self.users = users
+        self.duration = duration
+        self.ramp_up = ramp_up
+        self.wait_scale = wait_scale
+        self.max_steps = max_steps
+        self.sample_interval = sample_interval
+        self.warmup = warmup
+        self.timeout = timeout
+
+        self.overall = LatencyRecorder()
+        self.per_node: Dict[str, LatencyRecorder] = {name: LatencyRecorder() for name in graph.http_nodes()}
+        self.iterations = {'completed': 0, 'failed': 0, 'aborted': 0}
+        self.samples: List[Dict[str, float]] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def _count(self, outcome: str):
+        with self._lock:
+            self.iterations[outcome] += 1
+
+    def _http(self, session: requests.Session, name: str, params: Dict, current: Dict,
+              outputs: Dict[str, Dict]) -> Optional[Dict]:
+        method = params.get('method', 'GET').upper()
+        parsed = urlparse(resolve_value(params.get('url', ''), current, outputs))
+        url = f"{self.base_url}{parsed.path}" + (f"?{parsed.query}" if parsed.query else '')
+
+        headers = {}
+        if params.get('sendHeaders'):
+            for header in params.get('headerParameters', {}).get('parameters', []):
+                headers[header['name']] = _to_text(resolve_value(header['value'], current, outputs))
+
+        body = None
+        if params.get('sendBody'):
+            body = resolve_value(params.get('jsonBody', '{}'), current, outputs)
+            if isinstance(body, str):
+                try:
+                    body = json.loads(body)
+                except json.JSONDecodeError:
+                    body = {}
+
+        started = time.perf_counter()
+        try:
+            response = session.request(method, url, headers=headers, json=body, timeout=self.timeout)
+            elapsed = time.perf_counter() - started
+            failed = response.status_code >= 400
+        except requests.exceptions.RequestException:
+            elapsed, failed, response = time.perf_counter() - started, True, None
+
+        self.overall.record(elapsed, failed)
+        self.per_node[name].record(elapsed, failed)
+        if failed:
+            return None
+
+        try:
+            result = response.json()
+        except ValueError:
+            result = {}
+        return result if isinstance(result, dict) else {'data': result}
+
+    def _condition(self, params: Dict, current: Dict, outputs: Dict[str, Dict]) -> bool:
+        checks = []
+        for kind, conditions in params.get('conditions', {}).items():
+            for condition in conditions:
+                left = resolve_value(condition.get('value1'), current, outputs)
+                right = resolve_value(condition.get('value2'), current, outputs)
+                checks.append(_compare(kind, condition.get('operation', 'equal'), left, right))
+        if not checks:
+            return False
+        return any(checks) if params.get('combineOperation') == 'any' else all(checks)
+
+    def run_iteration(self, session: requests.Session, trigger_body: Dict) -> str:
+        """
+        Run the workflow once for a single virtual user
+
+        Args:
+            session: HTTP session owned by the virtual user
+            trigger_body: Body of the simulated webhook call
+
+        Returns:
+            'completed', 'failed' (an HTTP call failed) or 'aborted' (max_steps reached)
+        """
+        outputs: Dict[str, Dict] = {self.graph.start: {'body': trigger_body}}
+        pending: List[Tuple[str, Dict]] = [
+            (target, outputs[self.graph.start])
+            for target in (self.graph.edges.get(self.graph.start) or [[]])[0]
+        ]
+        steps = 0
+
+        while pending:
+            if self._stop.is_set():
+                return 'aborted'
+            steps += 1
+            if steps > self.max_steps:
+                return 'aborted'
+
+            name, current = pending.pop(0)
+            node = self.graph.nodes[name]
+            node_type = node['type'].rsplit('.', 1)[-1]
+            params = node.get('parameters', {})
+            branch = 0
+
+            if node_type == 'httpRequest':
+                result = self._http(session, name, params, current, outputs)
+                if result is None:
+                    return 'failed'
+            elif node_type == 'set':
+                result = dict(current)
+                for kind, values in params.get('values', {}).items():
+                    for entry in values:
+                        value = resolve_value(entry.get('value'), current, outputs)
+                        if kind == 'number' and not _is_number(value):
+                            value = float(value or 0)
+                        result[entry['name']] = value
+            elif node_type == 'if':
+                result = current
+                branch = 0 if self._condition(params, current, outputs) else 1
+            elif node_type == 'wait':
+                result = current
+                seconds = float(params.get('amount', 0)) * WAIT_UNITS.get(params.get('unit', 'seconds'), 1)
+                if seconds and self.wait_scale:
+                    self._stop.wait(seconds * self.wait_scale)
+            else:
+                result = current
+
+            outputs[name] = result
+            node_outputs = self.graph.edges.get(name, [])
+            if branch < len(node_outputs):
+                pending.extend((target, result) for target in node_outputs[branch])
+
+        return 'completed'
+
+    def _virtual_user(self, index: int):
+        session = requests.Session()
+        trigger_body = {'phone': f"5511{index:09d}"}
+        try:
+            while not self._stop.is_set():
+                self._count(self.run_iteration(session, trigger_body))
+        finally:
+            session.close()
+
+    def _sampler(self, started: float):
+        last_count, last_time = 0, started
+        while not self._stop.wait(self.sample_interval):
+            now = time.perf_counter()
+            count = self.overall.count
+            sample = _resource_snapshot()
+            sample['elapsed_s'] = now - started
+            sample['rps'] = (count - last_count) / (now - last_time)
+            self.samples.append(sample)
+            last_count, last_time = count, now
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Run the load test for the configured duration
+
+        Returns:
+            Report with throughput, latency percentiles and resource growth
+        """
+        started = time.perf_counter()
+        self._stop.clear()
+
+        sampler = threading.Thread(target=self._sampler, args=(started,), daemon=True)
+        sampler.start()
+
+        workers = []
+        for index in range(self.users):
+            worker = threading.Thread(target=self._virtual_user, args=(index,), daemon=True)
+            worker.start()
+            workers.append(worker)
+            if self.ramp_up and index < self.users - 1:
+                if self._stop.wait(self.ramp_up / self.users):
+                    break
+
+        self._stop.wait(max(0.0, self.duration - (time.perf_counter() - started)))
+        # Last resource sample is taken while the users are still running
+        last = _resource_snapshot()
+        last['elapsed_s'] = time.perf_counter() - started
+        self._stop.set()
+        for worker in workers:
+            worker.join(timeout=self.timeout)
+        sampler.join(timeout=1)
+
+        elapsed = time.perf_counter() - started
+        windows = [sample['rps'] for sample in self.samples]
+        in_run = self.samples + [last]
+
+        # Growth is measured from the first post-warm-up sample, so start-up allocations do not count
+        warm = next((sample for sample in in_run if sample['elapsed_s'] >= self.warmup), in_run[0])
+        span = last['elapsed_s'] - warm['elapsed_s']
+        rss_growth = None if last['rss_mb'] is None else last['rss_mb'] - warm['rss_mb']
+        # Short spans turn noise into a misleading leak rate
+        rate_span = max(MIN_RATE_SPAN, 3 * self.sample_interval)
+
+        return {
+            'workflow': self.graph.name,
+            'users': self.users,
+            'elapsed_s': elapsed,
+            'iterations': dict(self.iterations),
+            'throughput': {
+                'requests_per_s': self.overall.count / elapsed if elapsed else 0.0,
+                'iterations_per_s': self.iterations['completed'] / elapsed if elapsed else 0.0,
+                'window_min_rps': min(windows) if windows else None,
+                'window_max_rps': max(windows) if windows else None,
+            },
+            'latency': self.overall.summary(),
+            'per_node': {name: recorder.summary() for name, recorder in self.per_node.items()},
+            'resources': {
+                'baseline': warm,
+                'last': last,
+                'peak': {key: max((sample[key] for sample in in_run if sample[key] is not None), default=None)
+                         for key in ('rss_mb', 'threads', 'fds')},
+                'rss_growth_mb': rss_growth,
+                'rss_growth_mb_per_hour': (rss_growth / span * 3600
+                                           if rss_growth is not None and span >= rate_span else None),
+                'samples': self.samples,
+            },
+        }
+
+
+def _compare(kind: str, operation: str, left: Any, right: Any) -> bool:
+    """Evaluate one condition of an n8n (v1) If node"""
+    if operation == 'isEmpty':
+        return left in (None, '')
+    if operation == 'isNotEmpty':
+        return left not in (None, '')
+
+    if kind == 'number':
+        try:
+            left, right = float(left), float(right)
+        except (TypeError, ValueError):
+            return False
+        return {
+            'smaller': left < right,
+            'smallerEqual': left <= right,
+            'larger': left > right,
+            'largerEqual': left >= right,
+            'notEqual': left != right,
+        }.get(operation, left == right)
+
+    if kind == 'boolean':
+        return (bool(left) == bool(right)) != (operation == 'notEqual')
+
+    left, right = _to_text(left), _to_text(right)
+    if operation == 'notEqual':
+        return left != right
+    if operation == 'contains':
+        return right in left
+    if operation == 'notContains':
+        return right not in left
+    if operation == 'startsWith':
+        return left.startswith(right)
+    if operation == 'endsWith':
+        return left.endswith(right)
+    if operation == 'regex':
+        return re.search(right, left) is not None
+    return left == right
+
+
+# ---------------------------------------------------------------------------
+# Stand-in server
+# ---------------------------------------------------------------------------
+
+class StandInServer:
+    """
+    Local in-memory stand-in for the UAZAPI endpoints used by the workflows
+
+    Instances report 'connected' after connect_after status checks, so the
+    status loop terminates. Instances are evicted after instance_ttl seconds
+    or once more than max_instances exist, so soak runs stay bounded.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency: float = 0.0,
+                 jitter: float = 0.0, connect_after: int = 3, instance_ttl: float = 600,
+                 max_instances: int = 10000):
+        """
+        Initialize the stand-in server
+
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+            latency: Artificial delay added to every response, in seconds
+            jitter: Random extra delay of up to this many seconds
+            connect_after: Status checks before an instance reports 'connected'
+            instance_ttl: Seconds an instance is kept after creation
+            max_instances: Instances kept before the oldest are evicted
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.connect_after = connect_after
+        self.instance_ttl = instance_ttl
+        self.max_instances = max_instances
+        self.instances: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+        self._serving = False
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'StandInServer':
+        self._serving = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        """Serve on the calling thread until stopped"""
+        self._serving = True
+        self._server.serve_forever()
+
+    def stop(self):
+        # shutdown() blocks until serve_forever() returns, so only call it if serving started
+        if self._serving:
+            self._server.shutdown()
+        self._server.server_close()
+
+    def _evict(self, now: float):
+        # Instances are stored in creation order, so expired ones are at the front
+        while self.instances:
+            token, instance = next(iter(self.instances.items()))
+            if len(self.instances) <= self.max_instances and now - instance['created'] < self.instance_ttl:
+                break
+            del self.instances[token]
+
+    def handle(self, method: str, path: str, headers: Dict[str, str], body: Dict) -> Tuple[int, Dict]:
+        """Dispatch one request, returning (status code, JSON body)"""
+        if self.latency or self.jitter:
+            time.sleep(self.latency + random.uniform(0, self.jitter))
+
+        if (method, path) == ('POST', '/instance/create'):
+            if not headers.get('admintoken'):
+                return 401, {'error': 'Missing admin token'}
+            instance_id = uuid.uuid4().hex[:15]
+            token = str(uuid.uuid4())
+            now = time.monotonic()
+            instance = {'id': instance_id, 'name': body.get('name', instance_id), 'status': 'disconnected',
+                        'qrcode': '', 'checks': 0, 'created': now}
+            with self._lock:
+                self.instances[token] = instance
+                self._evict(now)
+            return 200, {'token': token, 'instance': _public(instance)}
+
+        if method == 'POST' and path in ('/send/text', '/send/media'):
+            # The sending instance is an external, already connected one: any token is accepted
+            if not headers.get('token'):
+                return 401, {'error': 'Missing token'}
+            if not body.get('number'):
+                return 400, {'error': 'Missing number'}
+            return 200, {'status': 'sent', 'messageId': uuid.uuid4().hex}
+
+        with self._lock:
+            instance = self.instances.get(headers.get('token', ''))
+        if instance is None:
+            return 401, {'error': 'Invalid token'}
+
+        if (method, path) == ('POST', '/instance/connect'):
+            with self._lock:
+                if instance['status'] != 'connected':
+                    instance['status'] = 'connecting'
+                    instance['qrcode'] = PLACEHOLDER_QR
+            return 200, {'connected': instance['status'] == 'connected', 'instance': _public(instance)}
+
+        if (method, path) == ('GET', '/instance/status'):
+            with self._lock:
+                if instance['status'] == 'connecting':
+                    instance['checks'] += 1
+                    if instance['checks'] >= self.connect_after:
+                        instance['status'] = 'connected'
+                        instance['qrcode'] = ''
+            return 200, {'instance': _public(instance)}
+
+        return 404, {'error': f'Not found: {method} {path}'}
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def _dispatch(self, method: str):
+                length = int(self.headers.get('Content-Length') or 0)
+                raw = self.rfile.read(length) if length else b''
+                try:
+                    body = json.loads(raw) if raw else {}
+                except json.JSONDecodeError:
+                    body = {}
+                if not isinstance(body, dict):
+                    body = {}
+
+                status, payload = server.handle(method, urlparse(self.path).path,
+                                                {k.lower(): v for k, v in self.headers.items()}, body)
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self._dispatch('GET')
+
+            def do_POST(self):
+                self._dispatch('POST')
+
+        return Handler
+
+
+def _public(instance: Dict) -> Dict:
+    return {key: value for key, value in instance.items() if key not in ('checks', 'created')}
+
+
+def _serve_stand_in(conn, options: Dict):
+    server = StandInServer(**options)
+    conn.send(server.base_url)
+    conn.close()
+    server.serve_forever()
+
+
+def start_stand_in_process(**options) -> Tuple[multiprocessing.Process, str]:
+    """
+    Run a StandInServer in a separate process
+
+    Keeps the server's memory and threads out of the generator's resource
+    measurements.
+
+    Args:
+        **options: StandInServer arguments
+
+    Returns:
+        (process, base_url) - terminate the process when done
+    """
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(target=_serve_stand_in, args=(sender, options), daemon=True)
+    process.start()
+    sender.close()
+    base_url = receiver.recv()
+    receiver.close()
+    return process, base_url
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def print_report(report: Dict[str, Any]):
+    """Pretty-print a load test report"""
+    print("\n" + "="*60)
+    print(f"Load Test Report: {report['workflow']}")
+    print("="*60)
+
+    throughput = report['throughput']
+    iterations = report['iterations']
+    print(f"👥 Virtual users: {report['users']}   ⏱  Elapsed: {report['elapsed_s']:.1f}s")
+    print(f"🔁 Iterations: {iterations['completed']} completed, {iterations['failed']} failed, "
+          f"{iterations['aborted']} aborted")
+    print(f"🚀 Throughput: {throughput['requests_per_s']:.1f} req/s, {throughput['iterations_per_s']:.2f} iter/s")
+    if throughput['window_min_rps'] is not None:
+        print(f"   Sustained (per window): {throughput['window_min_rps']:.1f} - {throughput['window_max_rps']:.1f} req/s")
+
+    print("\n📊 Latency (ms)")
+    print(f"  {'node':28} {'count':>7} {'err':>5} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}")
+    rows = list(report['per_node'].items()) + [('ALL', report['latency'])]
+    for name, stats in rows:
+        print(f"  {name:28} {stats['count']:>7} {stats['errors']:>5} {stats['p50_ms']:>8.1f} "
+              f"{stats['p95_ms']:>8.1f} {stats['p99_ms']:>8.1f} {stats['max_ms']:>8.1f}")
+
+    resources = report['resources']
+    baseline, last, peak = resources['baseline'], resources['last'], resources['peak']
+    print(f"\n💾 Resources (from {baseline['elapsed_s']:.0f}s to {last['elapsed_s']:.0f}s)")
+    if resources['rss_growth_mb'] is None:
+        print("  RSS: n/a (needs /proc)")
+    else:
+        rate = resources['rss_growth_mb_per_hour']
+        rate_text = f"{rate:+.1f} MB/h" if rate is not None else "n/a, span too short"
+        print(f"  RSS: {baseline['rss_mb']:.1f} MB → {last['rss_mb']:.1f} MB "
+              f"({resources['rss_growth_mb']:+.1f} MB, {rate_text}), peak {peak['rss_mb']:.1f} MB")
+    print(f"  Threads: {baseline['threads']} → {last['threads']} (peak {peak['threads']})   "
+          f"FDs: {baseline['fds']} → {last['fds']} (peak {peak['fds']})")
+
+
+def main():
+    """
+    Replay a workflow against the local stand-in server (or --base-url)
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('workflow', nargs='?', default='n8n_workflow_simple.json',
+                        help='n8n workflow JSON file to replay')
+    parser.add_argument('--users', type=int, default=10, help='concurrent virtual users')
+    parser.add_argument('--duration', type=float, default=30, help='run length in seconds')
+    parser.add_argument('--ramp-up', type=float, default=0, help='seconds to start all users')
+    parser.add_argument('--wait-scale', type=float, default=0.0, help='multiplier for wait nodes (0 skips)')
+    parser.add_argument('--sample-interval', type=float, default=5, help='seconds between resource samples')
+    parser.add_argument('--warmup', type=float, default=10, help='seconds before the resource growth baseline')
+    parser.add_argument('--base-url', help='replay against this server instead of the stand-in')
+    parser.add_argument('--latency', type=float, default=0.0, help='stand-in response delay in seconds')
+    parser.add_argument('--jitter', type=float, default=0.0, help='stand-in random extra delay in seconds')
+    parser.add_argument('--connect-after', type=int, default=3, help='stand-in status checks before connected')
+    parser.add_argument('--instance-ttl', type=float, default=600, help='stand-in seconds to keep each instance')
+    parser.add_argument('--in-process', action='store_true',
+                        help='run the stand-in in the generator process (its memory then counts as growth)')
+    parser.add_argument('--json', metavar='FILE', help='also write the full report to FILE')
+    args = parser.parse_args()
+
+    graph = CallGraph.from_file(args.workflow)
+    print(graph.describe())
+
+    server = process = None
+    base_url = args.base_url
+    if not base_url:
+        options = {'latency': args.latency, 'jitter': args.jitter, 'connect_after': args.connect_after,
+                   'instance_ttl': args.instance_ttl}
+        if args.in_process:
+            server = StandInServer(**options).start()
+            base_url = server.base_url
+        else:
+            process, base_url = start_stand_in_process(**options)
+        print(f"\n🔹 Stand-in server on {base_url}")
+
+    try:
+        generator = LoadGenerator(graph, base_url, users=args.users, duration=args.duration,
+                                  ramp_up=args.ramp_up, wait_scale=args.wait_scale,
+                                  sample_interval=args.sample_interval, warmup=args.warmup)
+        report = generator.run()
+    finally:
+        if server:
+            server.stop()
+        if process:
+            process.terminate()
+            process.join()
+
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport saved to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+UAZAPI Adaptive Timeouts
+Derives per-endpoint request timeouts from observed latency and optionally
+hedges slow idempotent GETs with a duplicate request
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Optional, Dict, Any, Deque, Tuple, Union
+from urllib.parse import urlparse
+
+import requests
+
+# Read-only methods: abandoning one on a read timeout cannot leave a side effect behind
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class LatencyHistogram:
+    """
+    Rolling window of the most recent latencies for one endpoint
+    """
+
+    def __init__(self, window: int = 200):
+        """
+        Initialize the histogram
+
+        Args:
+            window: Number of most recent samples kept
+        """
+        self.samples: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    def record(self, seconds: float):
+        with self._lock:
+            self.samples.append(seconds)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """
+        Latency at the given percentile, or None if nothing was recorded
+
+        Args:
+            pct: Percentile between 0 and 100
+        """
+        with self._lock:
+            ordered = sorted(self.samples)
+        if not ordered:
+            return None
+        index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+
+class AdaptiveTimeouts:
+    """
+    Per-endpoint timeouts derived from observed latency
+
+    Until an endpoint has min_samples observations its timeout is `default`;
+    afterwards it is p99 x factor, clamped to [floor, ceiling]. Timed-out
+    requests are recorded at their elapsed time, so a genuinely slower
+    endpoint pushes its own timeout up instead of failing forever.
+
+    Methods with side effects (POST, PUT, PATCH, DELETE) only get an
+    adaptive connect timeout; their read timeout stays at
+    unsafe_read_timeout. A slow create or send that the server may already
+    have applied is therefore not abandoned, which would leave orphaned
+    instances or duplicate sends.
+
+    Callers see requests.exceptions.Timeout (ConnectTimeout/ReadTimeout)
+    when a call runs past its timeout.
+
+    With hedging enabled, a GET still running after the endpoint's p95 gets
+    a duplicate request, and whichever answers first wins. Each attempt runs
+    on its own thread, so no queueing delays the hedge. Hedging only pays off
+    when the duplicate can go out immediately: do not combine it with a
+    blocking connection pool or a concurrency limiter (UazapiExecutor
+    rejects it).
+
+    Example:
+        timeouts = AdaptiveTimeouts(hedge=True)
+        client = UazapiWhatsApp(BASE_URL, ADMIN_TOKEN, timeouts=timeouts)
+    """
+
+    def __init__(self, default: float = 30.0, floor: float = 1.0, ceiling: float = 30.0, factor: float = 3.0,
+                 unsafe_read_timeout: float = 60.0,
+                 timeout_percentile: float = 99, window: int = 200, min_samples: int = 20,
+                 hedge: bool = False, hedge_percentile: float = 95, max_hedges: int = 16):
+        """
+        Initialize adaptive timeouts
+
+        Args:
+            default: Timeout in seconds while an endpoint has too few samples
+            floor: Lowest timeout ever used, in seconds
+            ceiling: Highest timeout ever used, in seconds
+            factor: Multiplier applied to the timeout percentile
+            unsafe_read_timeout: Fixed read timeout for methods with side effects, in seconds
+            timeout_percentile: Percentile the timeout is derived from
+            window: Latency samples kept per endpoint
+            min_samples: Samples needed before adapting
+            hedge: Send a duplicate for GETs running past hedge_percentile
+            hedge_percentile: Percentile after which a GET is hedged
+            max_hedges: Duplicates in flight at once; slow calls beyond that are not hedged
+        """
+        if not 0 < floor <= ceiling:
+            raise ValueError("Timeouts need 0 < floor <= ceiling")
+        self.default = default
+        self.floor = floor
+        self.ceiling = ceiling
+        self.factor = factor
+        self.unsafe_read_timeout = unsafe_read_timeout
+        self.timeout_percentile = timeout_percentile
+        self.window = window
+        self.min_samples = min_samples
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.max_hedges = max_hedges
+
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+        self._hedge_slots = threading.BoundedSemaphore(max_hedges)
+
+    @staticmethod
+    def endpoint_key(method: str, url: str) -> str:
+        """Key identifying an endpoint, e.g. 'GET chatsheros.uazapi.com/instance/status'"""
+        parsed = urlparse(url)
+        return f"{method.upper()} {parsed.netloc}{parsed.path}"
+
+    def histogram(self, method: str, url: str) -> LatencyHistogram:
+        key = self.endpoint_key(method, url)
+        with self._lock:
+            if key not in self.histograms:
+                self.histograms[key] = LatencyHistogram(self.window)
+            return self.histograms[key]
+
+    def timeout(self, method: str, url: str) -> Union[float, Tuple[float, float]]:
+        """
+        Timeout to use for the next call to an endpoint
+
+        Returns:
+            Timeout in seconds, or a (connect, read) tuple for methods with side effects
+        """
+        histogram = self.histogram(method, url)
+        if len(histogram) < self.min_samples:
+            adaptive = self.default
+        else:
+            observed = histogram.percentile(self.timeout_percentile)
+            adaptive = min(self.ceiling, max(self.floor, observed * self.factor))
+
+        if method.upper() in SAFE_METHODS:
+            return adaptive
+        return adaptive, max(adaptive, self.unsafe_read_timeout)
+
+    def hedge_delay(self, method: str, url: str) -> Optional[float]:
+        """
+        Seconds after which a call should be hedged, or None if it should not be
+        """
+        if not self.hedge or method.upper() != 'GET':
+            return None
+        histogram = self.histogram(method, url)
+        if len(histogram) < self.min_samples:
+            return None
+        return histogram.percentile(self.hedge_percentile)
+
+    def observe(self, method: str, url: str, seconds: float):
+        """Record one call's latency for an endpoint"""
+        self.histogram(method, url).record(seconds)
+
+    def _timed(self, http: Any, method: str, url: str, kwargs: Dict) -> requests.Response:
+        timeout = self.timeout(method, url)
+        started = time.perf_counter()
+        try:
+            response = http.request(method, url, timeout=timeout, **kwargs)
+        except requests.exceptions.Timeout:
+            self.observe(method, url, time.perf_counter() - started)
+            raise
+        self.observe(method, url, time.perf_counter() - started)
+        return response
+
+    def _start(self, http: Any, method: str, url: str, kwargs: Dict, slot: bool = False) -> Future:
+        """Run one attempt on its own thread, releasing a hedge slot when it finishes"""
+        future: Future = Future()
+
+        def attempt():
+            try:
+                future.set_result(self._timed(http, method, url, kwargs))
+            except BaseException as exc:
+                future.set_exception(exc)
+            finally:
+                if slot:
+                    self._hedge_slots.release()
+
+        threading.Thread(target=attempt, name='uazapi-hedge', daemon=True).start()
+        return future
+
+    def request(self, http: Any, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send a request with an adaptive timeout, hedging it if enabled
+
+        Args:
+            http: requests module or a requests.Session
+            method: HTTP method
+            url: Full URL
+            **kwargs: Passed to http.request (headers, json, params, ...)
+
+        Returns:
+            The first successful response
+
+        Raises:
+            requests.exceptions.RequestException: If every attempt failed
+        """
+        method = method.upper()
+        delay = self.hedge_delay(method, url)
+        if delay is None:
+            return self._timed(http, method, url, kwargs)
+
+        attempts = [self._start(http, method, url, kwargs)]
+        done, _ = wait(attempts, timeout=delay)
+        if not done and self._hedge_slots.acquire(blocking=False):
+            attempts.append(self._start(http, method, url, kwargs, slot=True))
+
+        # First success wins; the slower attempt finishes in the background
+        pending = set(attempts)
+        while True:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+            if not pending:
+                return next(iter(done)).result()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Current samples, p50/p95/p99 and timeout for every observed endpoint"""
+        with self._lock:
+            histograms = dict(self.histograms)
+        result = {}
+        for key, histogram in histograms.items():
+            method, _, rest = key.partition(' ')
+            result[key] = {
+                'samples': len(histogram),
+                'p50': histogram.percentile(50),
+                'p95': histogram.percentile(95),
+                'p99': histogram.percentile(99),
+                'timeout': self.timeout(method, f"//{rest}"),
+            }
+        return result
@@ -7,6 +7,9 @@ Simple client to create instance, start it, and retrieve QR code
 import requests
 import json
 import time
+from typing import Optional, Any
+
+from uazapi_timeouts import AdaptiveTimeouts
 
 
 class UazapiWhatsApp:
@@ -18,18 +21,28 @@ class UazapiWhatsApp:
     Required:
     - Admin Token for creating instances
     - Instance Token (returned from create) for connecting and getting QR
+
+    Requests run under AdaptiveTimeouts and raise requests.exceptions.Timeout
+    when the server does not answer in time. For create/connect a
+    ReadTimeout does not mean the call failed: the server may have applied it.
     """
 
-    def __init__(self, base_url: str, admin_token: str):
+    def __init__(self, base_url: str, admin_token: str, session: Any = None,
+                 timeouts: Optional[AdaptiveTimeouts] = None):
         """
         Initialize UAZAPI client
 
         Args:
             base_url: Base URL of the API (e.g., https://chatsheros.uazapi.com)
             admin_token: Admin token for authentication
+            session: Any object with a requests-style request() method, e.g. a requests.Session
+                or the executor's ThreadLocalSession; defaults to the requests module
+            timeouts: Per-endpoint adaptive timeouts (defaults to 30s until latency is observed)
         """
         self.base_url = base_url.rstrip('/')
         self.admin_token = admin_token
+        self.http = session or requests
+        self.timeouts = timeouts or AdaptiveTimeouts()
 
     def create_instance(self, name: str):
         """
@@ -55,7 +68,7 @@ class UazapiWhatsApp:
         }
         payload = {'name': name}
 
-        response = requests.post(url, headers=headers, json=payload)
+        response = self.timeouts.request(self.http, 'POST', url, headers=headers, json=payload)
         return response.json()
 
     def connect_instance(self, instance_token: str):
@@ -81,7 +94,7 @@ class UazapiWhatsApp:
             'token': instance_token
         }
 
-        response = requests.post(url, headers=headers, json={})
+        response = self.timeouts.request(self.http, 'POST', url, headers=headers, json={})
         return response.json()
 
     def get_instance_status(self, instance_token: str):
@@ -106,7 +119,7 @@ class UazapiWhatsApp:
             'token': instance_token
         }
 
-        response = requests.get(url, headers=headers)
+        response = self.timeouts.request(self.http, 'GET', url, headers=headers)
         return response.json()
 
     def save_qr_code(self, qrcode_data: str, filename: str = "whatsapp_qr.png"):